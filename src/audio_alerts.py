@@ -3,8 +3,13 @@ Audio alerts module for driver drowsiness detection system with continuous playb
 and Gemini API integration for voice analysis
 """
 
+import collections
+import functools
+import hashlib
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pygame
 import os
 import json
@@ -12,116 +17,298 @@ import requests
 from gtts import gTTS
 import speech_recognition as sr
 
+# Optional offline TTS engine; gTTS (network) is the fallback
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
+
+# Audio asset directory, resolved (and created) once at import time so the
+# alert paths don't re-run abspath/dirname and a mkdir syscall on every call
+_AUDIO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audio")
+os.makedirs(_AUDIO_DIR, exist_ok=True)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_sound(path):
+    """
+    Decode an audio file into a pygame Sound, once per unique path
+
+    pygame.mixer.Sound decodes the whole file to PCM in memory, so caching
+    keeps that to a single decode per file for the life of the process.
+    Only safe for content-stable paths (alert files are content-addressed).
+    """
+    return pygame.mixer.Sound(path)
+
 class AudioAlerts:
     """
     Class to handle audio alerts for drowsiness detection with continuous playback,
     voice response detection, and Gemini API integration
     """
     
-    def __init__(self, normal_message="Hey, are you awake?", 
-                 extreme_message="Alert! Wake up now!", 
+    def __init__(self, normal_message="Hey, are you awake?",
+                 extreme_message="Alert! Wake up now!",
+                 no_face_message="No face detected! Please position yourself in front of the camera.",
                  volume=0.8,
+                 tts_backend="auto",
                  gemini_api_key=None,
                  gemini_api_url="https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"):
         """
         Initialize audio alerts
-        
+
         Args:
             normal_message (str): Message for normal drowsiness level
             extreme_message (str): Message for extreme drowsiness level
+            no_face_message (str): Message played when no face is detected
             volume (float): Volume level (0.0 to 1.0)
+            tts_backend (str): Speech synthesis engine - "auto" (prefer
+                offline), "pyttsx3" (offline only), or "gtts" (network)
             gemini_api_key (str): API key for Gemini API
             gemini_api_url (str): URL for Gemini API endpoint
         """
         self.normal_message = normal_message
         self.extreme_message = extreme_message
+        self.no_face_message = no_face_message
         self.volume = volume
+        self.tts_backend = tts_backend
         self.gemini_api_key = gemini_api_key
         self.gemini_api_url = gemini_api_url
+
+        # Reuse one HTTP session so repeated API calls keep the TCP/TLS
+        # connection alive instead of paying a fresh handshake every alert
+        # cycle, with a small pool and backoff-retries on transient failures
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=2, pool_maxsize=4,
+            max_retries=requests.adapters.Retry(total=2, backoff_factor=0.3))
+        self._session.mount("https://", adapter)
+
+        # Small worker pool so TTS synthesis can overlap in-flight API calls
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
         
-        # Initialize pygame mixer
-        pygame.mixer.init()
-        pygame.mixer.set_num_channels(4)  # Added one more channel for Gemini responses
-        
-        # Set up channels
-        self.normal_channel = pygame.mixer.Channel(0)
-        self.extreme_channel = pygame.mixer.Channel(1)
-        self.no_face_channel = pygame.mixer.Channel(2)
-        self.gemini_channel = pygame.mixer.Channel(3)
-        
+        # Mixer and alert sounds are initialized lazily on the first play so
+        # startup (and sessions that never trigger an alert) pay no mixer cost
+        self._audio_ready = False
+
         # Set up alert states
         self.normal_alert_active = False
         self.extreme_alert_active = False
         self.system_alert_active = False
 
+        # Periodic re-triggering of the normal alert, driven from update()
+        # (called once per frame) rather than a dedicated timer thread
+        self.normal_alert_interval = 5.0
+        self.last_normal_alert_time = 0.0
+
         # Current drowsiness level
         self.current_drowsiness_level = "AWAKE"
         
-        # Initialize voice recognition
+        # Initialize voice recognition. A startup adjust_for_ambient_noise call
+        # would record and analyze a full second of audio before the detector
+        # can run, and the dynamic threshold keeps re-estimating RMS energy
+        # between frames — a known source of long pre-roll stalls — so pin a
+        # fixed threshold; the listen loop's own percentile gate handles
+        # ambient-noise adaptation.
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        
-        # Calibrate recognizer for ambient noise
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source)
-        
-        # Thread for voice detection
+        self.recognizer.energy_threshold = 300
+        self.recognizer.dynamic_energy_threshold = False
+        # Detect end-of-utterance sooner than the 0.8s default so short
+        # spoken responses reach recognition with less trailing silence
+        self.recognizer.pause_threshold = 0.5
+        self.recognizer.non_speaking_duration = 0.3
+        
+        # Thread for voice detection; an Event (rather than a plain bool) so the
+        # worker and main threads never race on the flag and waits are
+        # interruptible the moment shutdown is requested
         self.voice_detection_thread = None
-        self.stop_voice_detection = False
-        
-        # Store recent system messages for echo cancellation
-        self.recent_system_messages = []
-        
+        self._stop_voice = threading.Event()
+
+        # Process-lifetime shutdown flag (distinct from the per-session
+        # _stop_voice, which is cleared at the start of each voice session)
+        self._shutdown = threading.Event()
+
+        # Set by the playback dispatcher when every channel has gone idle
+        self._playback_done = threading.Event()
+        self._playback_done.set()
+        
+        # Recent system messages for echo cancellation, kept as
+        # (lowercased text, frozenset of tokens) pairs so the similarity
+        # check doesn't re-tokenize every message on every utterance
+        self.recent_system_messages = collections.deque(maxlen=5)
+
+        # Minimum mean amplitude a capture must reach before it is worth
+        # uploading for speech recognition; the floor is raised adaptively
+        # from a rolling percentile of recent captures so a noisy cabin does
+        # not constantly trip the gate
+        self.min_speech_energy = 300.0
+        self._energy_hist = collections.deque(maxlen=64)
+
+        # In-memory LRU of decoded response Sounds keyed by message, so
+        # recurring Gemini prompts skip both the synthesis and the PCM decode
+        self._sound_cache = collections.OrderedDict()
+        self._sound_cache_size = 32
+    
+    @functools.cached_property
+    def microphone(self):
+        """Microphone device, opened lazily on first voice detection"""
+        # Half the default 1024-sample chunk to shave mic-to-recognizer
+        # buffering latency
+        return sr.Microphone(chunk_size=512)
+
+    def _ensure_audio(self):
+        """Initialize the mixer, channels, and alert sounds on first use"""
+        if self._audio_ready:
+            return
+
+        # Initialize pygame mixer with a 512-sample buffer (~21ms at 24kHz)
+        # so detection-to-alert output latency stays low; the earlier 4096
+        # buffer added ~186ms to every alert and response. TTS speech is
+        # mono, so a single output channel halves the mixing work.
+        pygame.mixer.pre_init(frequency=24000, size=-16, channels=1, buffer=512)
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(4)  # One extra channel for Gemini responses
+
+        # Set up channels
+        self.normal_channel = pygame.mixer.Channel(0)
+        self.extreme_channel = pygame.mixer.Channel(1)
+        self.no_face_channel = pygame.mixer.Channel(2)
+        self.gemini_channel = pygame.mixer.Channel(3)
+
+        # Background dispatcher mirrors channel state into _playback_done so
+        # the voice thread can block on an Event instead of polling channel
+        # state itself every 100ms
+        threading.Thread(target=self._dispatch_playback_events, daemon=True).start()
+
         # Generate audio files if they don't exist
         self._generate_audio_files()
-    
+
+        self._audio_ready = True
+
+    @staticmethod
+    def _message_key(message, lang='en'):
+        """Compute a short content hash for a (message, lang) pair"""
+        return hashlib.sha1(f"{message}|{lang}".encode()).hexdigest()[:10]
+
+    def _synthesize(self, text, path_stem):
+        """
+        Render text to an audio file, reusing any cached render
+
+        Prefers pyttsx3 when installed: synthesis is local (no network
+        round-trip) and the WAV output loads as raw PCM with no MP3 decode.
+        Falls back to gTTS when pyttsx3 is unavailable or fails.
+
+        Args:
+            text (str): Message to synthesize
+            path_stem (str): Target path without extension
+
+        Returns:
+            str: Path of the audio file written (or already cached)
+        """
+        wav_path = path_stem + ".wav"
+        mp3_path = path_stem + ".mp3"
+
+        if os.path.exists(wav_path):
+            return wav_path
+        if os.path.exists(mp3_path):
+            return mp3_path
+
+        if self.tts_backend in ("auto", "pyttsx3") and pyttsx3 is not None:
+            try:
+                engine = pyttsx3.init()
+                engine.save_to_file(text, wav_path)
+                engine.runAndWait()
+                if os.path.exists(wav_path):
+                    return wav_path
+            except Exception as e:
+                print(f"Offline TTS failed ({e}), falling back to gTTS")
+        elif self.tts_backend == "pyttsx3":
+            print("Warning: pyttsx3 backend requested but not installed; using gTTS")
+
+        tts = gTTS(text=text, lang='en')
+        tts.save(mp3_path)
+        return mp3_path
+
     def _generate_audio_files(self):
-        """Generate audio files for alerts using gTTS"""
-        # Create audio directory if it doesn't exist
-        audio_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audio")
-        os.makedirs(audio_dir, exist_ok=True)
-        
-        # Generate normal alert audio
-        normal_audio_path = os.path.join(audio_dir, "alert_normal.mp3")
-        if not os.path.exists(normal_audio_path) or True:  # Always regenerate for testing
-            tts = gTTS(text=self.normal_message, lang='en')
-            tts.save(normal_audio_path)
-        
-        # Generate extreme alert audio
-        extreme_audio_path = os.path.join(audio_dir, "alert_extreme.mp3")
-        if not os.path.exists(extreme_audio_path) or True:  # Always regenerate for testing
-            tts = gTTS(text=self.extreme_message, lang='en')
-            tts.save(extreme_audio_path)
-        
+        """Generate audio files for alerts (skipped when cached on disk)"""
+        # Generate normal and extreme alert audio. Like the no-face clip, the
+        # filenames carry a content hash: editing a message in the config
+        # yields a new file, while an unchanged message reuses the cached one
+        normal_audio_path = self._synthesize(
+            self.normal_message,
+            os.path.join(_AUDIO_DIR, f"alert_normal_{self._message_key(self.normal_message)}"))
+        extreme_audio_path = self._synthesize(
+            self.extreme_message,
+            os.path.join(_AUDIO_DIR, f"alert_extreme_{self._message_key(self.extreme_message)}"))
+
+        # Generate no-face alert audio, keyed by message content so a changed
+        # message in the config produces a fresh file instead of a stale replay
+        no_face_audio_path = self._synthesize(
+            self.no_face_message,
+            os.path.join(_AUDIO_DIR, f"alert_no_face_{self._message_key(self.no_face_message)}"))
+
         # Load audio files
-        self.normal_alert_sound = pygame.mixer.Sound(normal_audio_path)
-        self.extreme_alert_sound = pygame.mixer.Sound(extreme_audio_path)
-        
+        self.normal_alert_sound = _load_sound(normal_audio_path)
+        self.extreme_alert_sound = _load_sound(extreme_audio_path)
+        self.no_face_sound = _load_sound(no_face_audio_path)
+
         # Set volume
         self.normal_alert_sound.set_volume(self.volume)
         self.extreme_alert_sound.set_volume(self.volume)
-        
+        self.no_face_sound.set_volume(self.volume)
+
         # Add system messages to the recent messages list for echo cancellation
-        self.recent_system_messages.append(self.normal_message.lower())
-        self.recent_system_messages.append(self.extreme_message.lower())
+        self._remember_system_message(self.normal_message)
+        self._remember_system_message(self.extreme_message)
+        self._remember_system_message(self.no_face_message)
     
+    def _play_streamed(self, path):
+        """
+        Play a one-shot clip by streaming it from disk
+
+        mixer.music decodes incrementally while playing, so memory stays
+        constant regardless of clip length — unlike Sound, which decodes the
+        whole file up front. The short looping alerts stay on Channels, where
+        low-latency mixing and independent stop control are needed.
+
+        Args:
+            path (str): Audio file to stream
+        """
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play()
+
+    @staticmethod
+    def _prune_audio_cache(keep=64):
+        """Evict the oldest content-addressed response clips beyond the limit"""
+        cached = [os.path.join(_AUDIO_DIR, name) for name in os.listdir(_AUDIO_DIR)
+                  if name.startswith(("response_", "alert_no_face_"))]
+        if len(cached) <= keep:
+            return
+        cached.sort(key=os.path.getmtime)
+        for path in cached[:len(cached) - keep]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
     def _generate_temp_audio(self, message):
-        """Generate a temporary audio file with the given message"""
-        audio_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audio")
-        temp_audio_path = os.path.join(audio_dir, "temp_response.mp3")
-        
-        tts = gTTS(text=message, lang='en')
-        tts.save(temp_audio_path)
-        
+        """Generate an audio clip for a response message, reusing cached renders"""
+        # Repeat prompts are served straight from memory
+        if message in self._sound_cache:
+            self._sound_cache.move_to_end(message)
+            return self._sound_cache[message]
+
+        temp_audio_path = self._synthesize(
+            message, os.path.join(_AUDIO_DIR, f"response_{self._message_key(message)}"))
+        self._prune_audio_cache()
+
         temp_sound = pygame.mixer.Sound(temp_audio_path)
         temp_sound.set_volume(self.volume)
-        
-        # Add this message to recent system messages for echo cancellation
-        self.recent_system_messages.append(message.lower())
-        # Keep only last 5 messages to avoid memory bloat
-        if len(self.recent_system_messages) > 5:
-            self.recent_system_messages.pop(0)
-            
+
+        self._sound_cache[message] = temp_sound
+        if len(self._sound_cache) > self._sound_cache_size:
+            self._sound_cache.popitem(last=False)
+
         return temp_sound
     
     def _send_to_gemini_api(self, user_speech, drowsiness_level):
@@ -178,63 +365,114 @@ class AudioAlerts:
         url = f"{self.gemini_api_url}?key={self.gemini_api_key}"
         
         try:
-            response = requests.post(url, headers=headers, json=data)
+            # Bounded connect/read timeouts with one retry on timeout, so a
+            # stalled request can't hang the voice thread indefinitely
+            response = None
+            for attempt in range(2):
+                try:
+                    response = self._session.post(url, headers=headers, json=data,
+                                                  timeout=(3, 8))
+                    break
+                except requests.exceptions.Timeout:
+                    if attempt == 1:
+                        raise
+                    print("Gemini API request timed out, retrying...")
             response.raise_for_status()
             
             # Parse the response
             resp_json = response.json()
             text_response = resp_json.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
             
-            # Extract the JSON part from the text response
-            try:
-                # Find JSON in the response (it might be mixed with other text)
-                start_idx = text_response.find('{')
-                end_idx = text_response.rfind('}') + 1
-                
-                if start_idx >= 0 and end_idx > 0:
-                    json_str = text_response[start_idx:end_idx]
-                    result = json.loads(json_str)
+            # Extract the JSON object from the text response: raw_decode parses
+            # exactly one JSON value from the first brace, which handles nested
+            # braces in surrounding explanatory text and avoids the second
+            # O(n) rfind scan of the payload
+            start_idx = text_response.find('{')
+            if start_idx >= 0:
+                try:
+                    result, _ = json.JSONDecoder().raw_decode(text_response, start_idx)
                     return result
-                else:
-                    return {"convinced": False, "message": "Could not parse Gemini API response."}
-            except json.JSONDecodeError:
-                return {"convinced": False, "message": "Could not parse Gemini API response."}
+                except json.JSONDecodeError:
+                    pass
+            return {"convinced": False, "message": "Could not parse Gemini API response."}
                 
         except requests.exceptions.RequestException as e:
             print(f"Error calling Gemini API: {e}")
             return {"convinced": False, "message": "Error communicating with Gemini API."}
     
+    def _any_playback_busy(self):
+        """Check whether any alert channel or the music stream is playing"""
+        return (self.normal_channel.get_busy() or
+                self.extreme_channel.get_busy() or
+                self.gemini_channel.get_busy() or
+                self.no_face_channel.get_busy() or
+                pygame.mixer.music.get_busy())
+
+    def _dispatch_playback_events(self):
+        """Poll playback state and flip _playback_done accordingly"""
+        # Plain 20ms poll: channel end-events would need the pygame event
+        # queue, which only exists with a video backend (the UI here is
+        # OpenCV's), and pygame's event functions are main-thread-only anyway
+        while not self._shutdown.is_set():
+            if self._any_playback_busy():
+                self._playback_done.clear()
+            else:
+                self._playback_done.set()
+            self._shutdown.wait(0.02)
+
+    @staticmethod
+    def _audio_energy(audio):
+        """
+        Compute the mean absolute amplitude of captured audio
+
+        Vectorized with NumPy so the int16 samples are decoded in one
+        C-level pass instead of a per-sample Python loop.
+
+        Args:
+            audio (sr.AudioData): Captured audio data
+
+        Returns:
+            float: Mean absolute sample amplitude (0 for empty captures)
+        """
+        samples = np.frombuffer(audio.get_raw_data(), dtype=np.int16)
+        if samples.size == 0:
+            return 0.0
+        return float(np.abs(samples).mean())
+
+    def _remember_system_message(self, message):
+        """Record a played system message (with its token set) for echo checks"""
+        lower = message.lower()
+        entry = (lower, frozenset(lower.split()))
+        # Replaying a known message refreshes its slot rather than spending
+        # a second one and evicting a still-live alert message
+        try:
+            self.recent_system_messages.remove(entry)
+        except ValueError:
+            pass
+        self.recent_system_messages.append(entry)
+
     def _is_system_audio_echo(self, text):
         """
         Check if the recognized text is an echo of system messages
-        
+
         Args:
             text (str): Recognized text to check
-            
+
         Returns:
             bool: True if the text matches a recent system message, False otherwise
         """
         text_lower = text.lower()
-        
-        # Check for exact match or high similarity with any recent system messages
-        for message in self.recent_system_messages:
-            # Check for exact match
-            if message in text_lower:
-                return True
-                
-            # Check for similarity (if message is at least 60% of the recognized text)
-            message_words = set(message.split())
-            text_words = set(text_lower.split())
-            common_words = message_words.intersection(text_words)
-            
-            if len(common_words) >= 0.6 * len(message_words) and len(message_words) > 3:
+        text_tokens = frozenset(text_lower.split())
+
+        # Check for exact match or high token overlap with any recent system
+        # message; token sets are precomputed when messages are recorded
+        for msg_lower, msg_tokens in self.recent_system_messages:
+            if msg_lower in text_lower:
                 return True
-            
-            if(text_lower.split("mini")[1:]):
-                return False
-            else:
+
+            if len(msg_tokens) > 3 and len(msg_tokens & text_tokens) >= 0.6 * len(msg_tokens):
                 return True
-                
+
         return False
     
     def _process_voice_with_gemini(self, audio):
@@ -250,9 +488,16 @@ class AudioAlerts:
                 return False
             
             print(f"User said: {user_speech}")
-            
-            # Send to Gemini API
-            gemini_response = self._send_to_gemini_api(user_speech, self.current_drowsiness_level)
+
+            # Send to Gemini API on the worker pool, and prefetch the generic
+            # fallback prompt while the request is in flight so a "not
+            # convinced" miss overlaps its synthesis with the network wait
+            fallback_message = "I'm not convinced you're fully alert. Please continue focusing."
+            gemini_future = self._io_pool.submit(
+                self._send_to_gemini_api, user_speech, self.current_drowsiness_level)
+            fallback_future = self._io_pool.submit(self._generate_temp_audio, fallback_message)
+
+            gemini_response = gemini_future.result()
             self.system_alert_active = True
 
             # Process response
@@ -261,16 +506,26 @@ class AudioAlerts:
                 self.stop_all_alerts()
                 
                 # Play confirmation message
-                confirm_sound = self._generate_temp_audio("You seem alert now. Drive safely.")
+                confirm_message = "You seem alert now. Drive safely."
+                confirm_sound = self._generate_temp_audio(confirm_message)
+                self._remember_system_message(confirm_message)
                 self.gemini_channel.play(confirm_sound)
                 return True
             else:
                 # Play custom message from Gemini
-                message = gemini_response.get("message", "I'm not convinced you're fully alert. Please continue focusing.")
+                message = gemini_response.get("message", fallback_message)
                 print(f"Gemini response: {message}")
-                
-                response_sound = self._generate_temp_audio(message)
+
+                if message == fallback_message:
+                    response_sound = fallback_future.result()
+                else:
+                    response_sound = self._generate_temp_audio(message)
                 self.stop_all_alerts()
+                # Recorded only here, at playback: the speculative fallback
+                # synthesis above must not register a message that was never
+                # actually heard, or it churns the alert messages out of the
+                # echo deque
+                self._remember_system_message(message)
                 self.gemini_channel.play(response_sound)
                 # Keep alerts active
                 return False
@@ -288,46 +543,60 @@ class AudioAlerts:
     def _listen_for_response(self):
         """Listen for voice response and process with Gemini API"""
         print("Voice detection started - say something to assess alertness")
-        self.stop_voice_detection = False
-        self.recognizer.energy_threshold = 1000
-        self.recognizer.dynamic_energy_threshold = True
-        
-        while not self.stop_voice_detection:
-            try:
-                # Wait until all audio playback has finished
-                while (self.normal_channel.get_busy() or 
-                       self.extreme_channel.get_busy() or 
-                       self.gemini_channel.get_busy() or
-                       self.no_face_channel.get_busy()):
-                    time.sleep(0.1)
-                    if self.stop_voice_detection:
-                        return
-                
-                # Add a small buffer after playback ends
-                time.sleep(0.5)
-                self.normal_channel.stop()
-                self.extreme_channel.stop()
-                self.gemini_channel.stop()
-                self.no_face_channel.stop()
-                with self.microphone as source:
+        self._stop_voice.clear()
+
+        # Open the microphone once for the whole session; re-entering the
+        # context manager per iteration reopens the PortAudio stream, which
+        # costs tens of ms of syscalls each listen cycle
+        with self.microphone as source:
+            while not self._stop_voice.is_set():
+                try:
+                    # Block until the dispatcher reports end of playback
+                    # rather than polling channel state every 100ms
+                    while self._any_playback_busy():
+                        self._playback_done.clear()
+                        self._playback_done.wait(timeout=1.0)
+                        if self._stop_voice.is_set():
+                            return
+
                     print("Listening for driver response...")
-                    # Adjust for ambient noise before each listening session
-                    self.recognizer.adjust_for_ambient_noise(source, duration=1.5)
-                    audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10.0)
-                    
-                # Process with Gemini instead of just stopping alerts
-                is_alert = self._process_voice_with_gemini(audio)
-                if is_alert:
-                    self.system_alert_active = False
-                    break
-                    
-            except sr.WaitTimeoutError:
-                # Just timeout, continue listening
-                print("No response detected, continuing to listen...")
-            except Exception as e:
-                print(f"Error in voice detection: {e}")
-            
-            time.sleep(0.1)
+                    # Short listen timeout so the stop Event is re-checked
+                    # frequently; a long blocking listen would stall teardown.
+                    # The phrase cap bounds how long recording can run before
+                    # recognition starts — an alertness check never needs a
+                    # ten-second answer.
+                    audio = self.recognizer.listen(source, timeout=0.5, phrase_time_limit=5.0)
+
+                    # Cheap local energy gate: don't ship silence or ambient
+                    # noise across the network just to have it rejected. The
+                    # threshold tracks the ambient level via a rolling
+                    # percentile so it specializes to the actual environment.
+                    energy = self._audio_energy(audio)
+                    threshold = self.min_speech_energy
+                    if len(self._energy_hist) >= 8:
+                        threshold = max(
+                            threshold, float(np.percentile(self._energy_hist, 90)) * 1.5)
+                    if energy < threshold:
+                        # Only rejected captures feed the history: they are
+                        # ambient by definition, whereas folding accepted
+                        # speech in would push the percentile up to the
+                        # driver's own volume and lock their voice out
+                        self._energy_hist.append(energy)
+                        continue
+
+                    # Process with Gemini instead of just stopping alerts
+                    is_alert = self._process_voice_with_gemini(audio)
+                    if is_alert:
+                        self.system_alert_active = False
+                        break
+
+                except sr.WaitTimeoutError:
+                    # Just a short timeout so the stop Event is polled; keep listening
+                    pass
+                except Exception as e:
+                    print(f"Error in voice detection: {e}")
+
+                self._stop_voice.wait(0.1)
     
     def start_voice_detection(self):
         """Start voice detection in a separate thread"""
@@ -338,20 +607,30 @@ class AudioAlerts:
     
     def stop_voice_detection(self):
         """Stop voice detection thread"""
-        self.stop_voice_detection = True
+        self._stop_voice.set()
         if self.voice_detection_thread and self.voice_detection_thread.is_alive():
             self.voice_detection_thread.join(timeout=1.0)
     
     def play_normal_alert(self):
-        """Start playing normal alert in a loop"""
-        if not self.normal_alert_active and not self.extreme_alert_active and not self.system_alert_active:
+        """Play the normal alert, re-triggering at a fixed interval while drowsy"""
+        if self.extreme_alert_active or self.system_alert_active:
+            return
+
+        self._ensure_audio()
+
+        if (not self.normal_channel.get_busy() and
+                time.time() - self.last_normal_alert_time >= self.normal_alert_interval):
             self.normal_alert_active = True
+            self.last_normal_alert_time = time.time()
+            self._remember_system_message(self.normal_message)
             self.normal_channel.play(self.normal_alert_sound, loops=0)  # Play once, not looping
             # Start voice detection after alert (it'll wait for playback to finish)
             self.start_voice_detection()
     
     def play_extreme_alert(self):
         """Start playing extreme alert in a loop"""
+        self._ensure_audio()
+
         # Stop normal alert if playing
         if (not self.normal_channel.get_busy()):
             if self.normal_alert_active:
@@ -360,6 +639,7 @@ class AudioAlerts:
             
             if not self.extreme_alert_active and not self.system_alert_active:
                 self.extreme_alert_active = True
+                self._remember_system_message(self.extreme_message)
                 self.extreme_channel.play(self.extreme_alert_sound, loops=0)  # Play once, not looping
                 # Start voice detection after alert (it'll wait for playback to finish)
                 self.start_voice_detection()
@@ -367,13 +647,15 @@ class AudioAlerts:
     def stop_normal_alert(self):
         """Stop normal alert if playing"""
         if self.normal_alert_active:
-            self.normal_channel.stop()
+            # Short fadeout instead of a hard stop: silence still lands within
+            # ~50ms but without the audible click of cutting mid-buffer
+            self.normal_channel.fadeout(50)
             self.normal_alert_active = False
-    
+
     def stop_extreme_alert(self):
         """Stop extreme alert if playing"""
         if self.extreme_alert_active:
-            self.extreme_channel.stop()
+            self.extreme_channel.fadeout(50)
             self.extreme_alert_active = False
     
     def stop_all_alerts(self):
@@ -388,9 +670,15 @@ class AudioAlerts:
         Args:
             drowsiness_level (str): Current drowsiness level ("AWAKE", "NORMAL", or "EXTREME")
         """
+        # A frame that stays AWAKE has nothing to do; skip the dispatch and
+        # its pygame channel checks. Unchanged NORMAL/EXTREME levels still
+        # fall through because the play paths handle interval re-triggering.
+        if drowsiness_level == "AWAKE" and self.current_drowsiness_level == "AWAKE":
+            return
+
         # Store current drowsiness level for use with Gemini API
         self.current_drowsiness_level = drowsiness_level
-        
+
         if drowsiness_level == "EXTREME":
             self.play_extreme_alert()
         elif drowsiness_level == "NORMAL":
@@ -400,34 +688,34 @@ class AudioAlerts:
     
     def cleanup(self):
         """Clean up pygame mixer and stop threads"""
-        self.stop_voice_detection = True
+        self._shutdown.set()
+        self.stop_voice_detection()
         self.stop_all_alerts()
-        pygame.mixer.quit()
+        self._io_pool.shutdown(wait=False)
+        if self._audio_ready:
+            pygame.mixer.quit()
 
-    def play_no_face_alert(self, message="No face detected! Please position yourself in front of the camera."):
+    def play_no_face_alert(self, message=None):
         """
         Play a one-time alert when no face is detected
-        
+
         Args:
-            message (str): Message to play when no face is detected
+            message (str): Message to play; defaults to the preloaded no-face message
         """
-        # Create audio directory if it doesn't exist
-        audio_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audio")
-        os.makedirs(audio_dir, exist_ok=True)
-        
-        # Generate no face alert audio
-        no_face_audio_path = os.path.join(audio_dir, "alert_no_face.mp3")
-        tts = gTTS(text=message, lang='en')
-        tts.save(no_face_audio_path)
-        
+        self._ensure_audio()
+
+        if message is None or message == self.no_face_message:
+            # Fast path: sound was synthesized and decoded once up front
+            self._remember_system_message(self.no_face_message)
+            self.no_face_channel.play(self.no_face_sound)
+            return
+
+        # Custom message: synthesize to a content-hashed file so repeats are cached
+        no_face_audio_path = self._synthesize(
+            message, os.path.join(_AUDIO_DIR, f"alert_no_face_{self._message_key(message)}"))
+
         # Add to recent messages for echo cancellation
-        self.recent_system_messages.append(message.lower())
-        if len(self.recent_system_messages) > 5:
-            self.recent_system_messages.pop(0)
-        
-        # Play the alert once (not looping)
-        no_face_sound = pygame.mixer.Sound(no_face_audio_path)
-        no_face_sound.set_volume(self.volume)
-        
-        # Use channel for the no-face alert
-        self.no_face_channel.play(no_face_sound)
\ No newline at end of file
+        self._remember_system_message(message)
+
+        # Stream the ad-hoc clip rather than decoding it fully into memory
+        self._play_streamed(no_face_audio_path)
\ No newline at end of file
@@ -2,6 +2,7 @@
 Drowsiness detection module using eye aspect ratio analysis
 """
 
+import collections
 import time
 
 class DrowsinessDetector:
@@ -36,17 +37,20 @@ class DrowsinessDetector:
         self.last_alert_time = 0
         self.current_drowsiness_level = "AWAKE"
         
-        # Add eye closure percentage tracking (for gradual detection)
-        self.eye_closure_history = []
+        # Add eye closure percentage tracking (for gradual detection).
+        # A bounded deque keeps the append O(1) (a list.pop(0) shifts every
+        # element at frame rate), and a running count of closed frames makes
+        # the percentage O(1) instead of re-summing the window per frame.
         self.history_size = 30  # Track last 30 frames
-        
+        self.eye_closure_history = collections.deque(maxlen=self.history_size)
+        self.closed_count = 0
+
     def _calculate_eye_closure_percentage(self):
         """Calculate percentage of recent frames where eyes were considered closed"""
         if not self.eye_closure_history:
             return 0
-        
-        closed_count = sum(1 for is_closed in self.eye_closure_history if is_closed)
-        return (closed_count / len(self.eye_closure_history)) * 100
+
+        return (self.closed_count / len(self.eye_closure_history)) * 100
     
     def detect(self, eye_aspect_ratio):
         """
@@ -58,17 +62,23 @@ class DrowsinessDetector:
         Returns:
             str: Drowsiness level - "AWAKE", "NORMAL", or "EXTREME"
         """
-        # Update eye closure history
+        # Pull the hot thresholds into locals once; attribute lookups add up
+        # in a function this small running at frame rate. monotonic is both
+        # cheaper than time.time and immune to wall-clock jumps.
+        ext_thresh = self.extreme_ear_threshold
+        norm_thresh = self.normal_ear_threshold
+        ext_dur = self.extreme_duration_threshold
+        norm_dur = self.normal_duration_threshold
+        now = time.monotonic()
+
+        # Update eye closure history and the running closed-frame count;
+        # account for the frame the full deque is about to evict
         is_closed = eye_aspect_ratio < self.eye_aspect_ratio_threshold
+        if len(self.eye_closure_history) == self.history_size:
+            self.closed_count -= self.eye_closure_history[0]
         self.eye_closure_history.append(is_closed)
-        
-        # Keep history at fixed size
-        if len(self.eye_closure_history) > self.history_size:
-            self.eye_closure_history.pop(0)
-        
-        # Calculate closure percentage over recent frames
-        closure_percentage = self._calculate_eye_closure_percentage()
-        
+        self.closed_count += is_closed
+
         # Check if eyes are closed based on EAR
         if is_closed:
             # Increment counter for consecutive frames with closed eyes
@@ -76,22 +86,28 @@ class DrowsinessDetector:
             
             # Start timer if not already started
             if self.drowsy_start_time is None:
-                self.drowsy_start_time = time.time()
-                
+                self.drowsy_start_time = now
+
             # Calculate drowsiness duration
-            drowsiness_duration = time.time() - self.drowsy_start_time
-            
-            # Determine drowsiness level based on duration, EAR, and closure pattern
-            if (eye_aspect_ratio <= self.extreme_ear_threshold and 
-                drowsiness_duration >= self.extreme_duration_threshold) or closure_percentage > 70:
+            drowsiness_duration = now - self.drowsy_start_time
+
+            # Determine drowsiness level based on duration, EAR, and closure
+            # pattern; the cheap EAR/duration comparisons run first so the
+            # closure percentage is only evaluated when they don't decide
+            if eye_aspect_ratio <= ext_thresh and drowsiness_duration >= ext_dur:
                 self.current_drowsiness_level = "EXTREME"
-            elif (eye_aspect_ratio <= self.normal_ear_threshold and 
-                  drowsiness_duration >= self.normal_duration_threshold) or closure_percentage > 50:
-                self.current_drowsiness_level = "NORMAL"
             else:
-                # Keep current level to avoid flickering between states
-                pass
+                closure_percentage = self._calculate_eye_closure_percentage()
+                if closure_percentage > 70:
+                    self.current_drowsiness_level = "EXTREME"
+                elif (eye_aspect_ratio <= norm_thresh and
+                      drowsiness_duration >= norm_dur) or closure_percentage > 50:
+                    self.current_drowsiness_level = "NORMAL"
+                else:
+                    # Keep current level to avoid flickering between states
+                    pass
         else:
+            closure_percentage = self._calculate_eye_closure_percentage()
             # If eyes are open but we have a pattern of frequent closures, maintain alert state
             if closure_percentage > 40:
                 # Don't reset immediately to avoid stopping alerts too early
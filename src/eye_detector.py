@@ -5,7 +5,47 @@ Eye detection and analysis module using dlib facial landmarks
 import dlib
 import numpy as np
 import cv2
-from scipy.spatial import distance as dist
+
+# Optional JIT compilation of the EAR kernel; the NumPy path is the fallback
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _ear_both(eyes):
+    """
+    Compute both eye aspect ratios from a (2,6,2) float32 landmark array
+
+    Args:
+        eyes (numpy.ndarray): Left and right eye landmarks, shape (2, 6, 2)
+
+    Returns:
+        numpy.ndarray: Length-2 array of eye aspect ratios
+    """
+    a = np.linalg.norm(eyes[:, 1] - eyes[:, 5], axis=1)
+    b = np.linalg.norm(eyes[:, 2] - eyes[:, 4], axis=1)
+    c = np.linalg.norm(eyes[:, 0] - eyes[:, 3], axis=1)
+    return (a + b) / (2.0 * c)
+
+
+if njit is not None:
+    # Scalar-math version of the same kernel: for arrays this tiny the NumPy
+    # dispatch overhead dominates the arithmetic, so the compiled loop wins.
+    # First call pays the JIT cost; later frames run at near-C speed.
+    @njit(cache=True, fastmath=True)
+    def _ear_both(eyes):
+        out = np.empty(2, dtype=np.float32)
+        for e in range(2):
+            a = ((eyes[e, 1, 0] - eyes[e, 5, 0]) ** 2 +
+                 (eyes[e, 1, 1] - eyes[e, 5, 1]) ** 2) ** 0.5
+            b = ((eyes[e, 2, 0] - eyes[e, 4, 0]) ** 2 +
+                 (eyes[e, 2, 1] - eyes[e, 4, 1]) ** 2) ** 0.5
+            c = ((eyes[e, 0, 0] - eyes[e, 3, 0]) ** 2 +
+                 (eyes[e, 0, 1] - eyes[e, 3, 1]) ** 2) ** 0.5
+            out[e] = (a + b) / (2.0 * c)
+        return out
+
 
 class EyeDetector:
     """
@@ -28,29 +68,58 @@ class EyeDetector:
         self.LEFT_EYE_INDICES = [36, 37, 38, 39, 40, 41]
         self.RIGHT_EYE_INDICES = [42, 43, 44, 45, 46, 47]
     
-    def detect(self, frame, face_rect):
+    def detect_face(self, frame, scale=0.5):
+        """
+        Detect faces with the dlib HOG detector on a downscaled frame
+
+        HOG detection cost scales with pixel count, so the detector runs on a
+        reduced grayscale copy and the boxes are mapped back to full
+        resolution; landmarks are still predicted on the full-res frame. The
+        main pipeline uses the DNN FaceDetector — this is a lighter fallback.
+
+        Args:
+            frame (numpy.ndarray): Input image
+            scale (float): Downscale factor applied before detection
+
+        Returns:
+            list: Detected face bounding boxes [x, y, width, height]
+        """
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        inv = 1.0 / scale
+        faces = []
+        for rect in self.detector(gray, 0):
+            faces.append([int(rect.left() * inv), int(rect.top() * inv),
+                          int(rect.width() * inv), int(rect.height() * inv)])
+
+        return faces
+
+    def detect(self, frame, face_rect, gray=None):
         """
         Detect facial landmarks
-        
+
         Args:
             frame (numpy.ndarray): Input image
             face_rect (list): Face bounding box [x, y, width, height]
-            
+            gray (numpy.ndarray): Optional precomputed grayscale frame;
+                passing it avoids dlib converting the BGR frame internally
+
         Returns:
             numpy.ndarray: Detected facial landmarks
         """
         # Convert OpenCV rectangle to dlib rectangle
         x, y, w, h = face_rect
         dlib_rect = dlib.rectangle(x, y, x + w, y + h)
-        
-        # Get facial landmarks
-        shape = self.predictor(frame, dlib_rect)
-        
-        # Convert landmarks to numpy array
-        landmarks = np.zeros((68, 2), dtype=np.int32)
-        for i in range(0, 68):
-            landmarks[i] = (shape.part(i).x, shape.part(i).y)
-        
+
+        # Get facial landmarks; the predictor only needs intensity, so a
+        # shared grayscale buffer saves a per-call color conversion
+        shape = self.predictor(gray if gray is not None else frame, dlib_rect)
+
+        # Convert landmarks to numpy array in one pass over shape.parts()
+        # rather than 68 indexed part(i) calls
+        landmarks = np.array([(p.x, p.y) for p in shape.parts()], dtype=np.int32)
+
         return landmarks
     
     def calculate_eye_aspect_ratio(self, landmarks):
@@ -66,41 +135,13 @@ class EyeDetector:
         Returns:
             tuple: Left and right eye aspect ratios
         """
-        # Get coordinates of left eye landmarks
-        left_eye = landmarks[self.LEFT_EYE_INDICES]
-        
-        # Get coordinates of right eye landmarks
-        right_eye = landmarks[self.RIGHT_EYE_INDICES]
-        
-        # Calculate eye aspect ratio for left eye
-        left_ear = self._calculate_ear(left_eye)
-        
-        # Calculate eye aspect ratio for right eye
-        right_ear = self._calculate_ear(right_eye)
-        
-        return left_ear, right_ear
-    
-    def _calculate_ear(self, eye):
-        """
-        Calculate the eye aspect ratio for a single eye
-        
-        Args:
-            eye (numpy.ndarray): Eye landmarks
-            
-        Returns:
-            float: Eye aspect ratio
-        """
-        # Calculate euclidean distance between horizontal eye landmarks
-        A = dist.euclidean(eye[1], eye[5])
-        B = dist.euclidean(eye[2], eye[4])
-        
-        # Calculate euclidean distance between vertical eye landmarks
-        C = dist.euclidean(eye[0], eye[3])
-        
-        # Calculate eye aspect ratio
-        ear = (A + B) / (2.0 * C)
-        
-        return ear
+        # Stack both eyes into one (2,6,2) tensor and run the fused kernel
+        # (JIT-compiled when numba is installed)
+        eyes = np.stack([landmarks[self.LEFT_EYE_INDICES],
+                         landmarks[self.RIGHT_EYE_INDICES]]).astype(np.float32)
+        ears = _ear_both(eyes)
+
+        return float(ears[0]), float(ears[1])
     
     def draw_eyes(self, frame, landmarks):
         """
@@ -113,16 +154,9 @@ class EyeDetector:
         Returns:
             None (modifies frame in-place)
         """
-        # Get coordinates of left eye landmarks
-        left_eye = landmarks[self.LEFT_EYE_INDICES]
-        
-        # Get coordinates of right eye landmarks
-        right_eye = landmarks[self.RIGHT_EYE_INDICES]
-        
-        # Draw left eye contour
-        left_eye_hull = cv2.convexHull(left_eye)
-        cv2.drawContours(frame, [left_eye_hull], -1, (0, 255, 255), 1)
-        
-        # Draw right eye contour
-        right_eye_hull = cv2.convexHull(right_eye)
-        cv2.drawContours(frame, [right_eye_hull], -1, (0, 255, 255), 1)
\ No newline at end of file
+        # The six landmarks of each eye are already stored in contour order,
+        # so both outlines can be drawn in one polylines call with no convex
+        # hull computation
+        cv2.polylines(frame,
+                      [landmarks[self.LEFT_EYE_INDICES], landmarks[self.RIGHT_EYE_INDICES]],
+                      isClosed=True, color=(0, 255, 255), thickness=1)
\ No newline at end of file
@@ -5,6 +5,8 @@ Face detection module using OpenCV DNN face detector
 import cv2
 import numpy as np
 import os
+from urllib.error import URLError
+from urllib.request import urlretrieve
 
 class FaceDetector:
     """
@@ -12,92 +14,189 @@ class FaceDetector:
     pre-trained Caffe model for face detection.
     """
     
-    def __init__(self, confidence_threshold=0.5):
+    def __init__(self, confidence_threshold=0.5, use_cuda=False, winograd=True):
         """
         Initialize the face detector
-        
+
         Args:
             confidence_threshold (float): Minimum confidence to consider a detection valid
+            use_cuda (bool): Run the network on the GPU via the CUDA backend
+            winograd (bool): Use Winograd convolutions (OpenCV 4.7+)
         """
         self.confidence_threshold = confidence_threshold
-        
+
         # Load the model
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        proto_path = os.path.join(current_dir, "..", "models", "deploy.prototxt")
-        model_path = os.path.join(current_dir, "..", "models", "res10_300x300_ssd_iter_140000.caffemodel")
-        
-        # If model files don't exist, download them
-        if not os.path.exists(proto_path) or not os.path.exists(model_path):
-            self._download_model(proto_path, model_path)
-        
-        # Load face detection model
-        self.face_net = cv2.dnn.readNet(proto_path, model_path)
+        models_dir = os.path.join(current_dir, "..", "models")
+        proto_path = os.path.join(models_dir, "deploy.prototxt")
+        model_path = os.path.join(models_dir, "res10_300x300_ssd_iter_140000.caffemodel")
+
+        # Prefer a quantized OpenVINO IR of the same SSD when one has been
+        # converted offline (mo + NNCF post-training INT8): roughly twice the
+        # forward() throughput on CPU at negligible accuracy loss
+        int8_xml = os.path.join(models_dir, "face_int8.xml")
+        int8_bin = os.path.join(models_dir, "face_int8.bin")
+        self.face_net = None
+        if os.path.exists(int8_xml) and os.path.exists(int8_bin):
+            try:
+                self.face_net = cv2.dnn.readNet(int8_xml, int8_bin)
+                self.face_net.setPreferableBackend(cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE)
+                self.face_net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            except cv2.error as e:
+                print(f"Could not load INT8 face model ({e}), using FP32 Caffe model")
+                self.face_net = None
+
+        if self.face_net is None:
+            # If model files don't exist, download them
+            if not os.path.exists(proto_path) or not os.path.exists(model_path):
+                self._download_model(proto_path, model_path)
+
+            # Load face detection model
+            self.face_net = cv2.dnn.readNet(proto_path, model_path)
+
+            # On GPU machines FP16 halves memory bandwidth and roughly doubles
+            # throughput over FP32; fall back silently to the CPU backend if
+            # this OpenCV build has no CUDA support
+            if use_cuda:
+                try:
+                    self.face_net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+                    self.face_net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA_FP16)
+                except cv2.error as e:
+                    print(f"CUDA backend unavailable ({e}), using CPU")
+
+        # Winograd convolutions give 1.5-2x throughput on the 3x3 conv
+        # layers that dominate the Res10 SSD; builds older than OpenCV 4.7
+        # simply don't have the call
+        if winograd:
+            try:
+                self.face_net.enableWinograd(True)
+            except (AttributeError, cv2.error):
+                pass
+
+        # Box-scaling vector cached per frame size; the camera resolution is
+        # fixed, so this avoids rebuilding the array for every detection
+        self._scale = None
+        self._scale_shape = None
+
+        # (boxes, confidences) per batch entry from the most recent call,
+        # for draw_detections; replaced wholesale so a reader never sees a
+        # half-built list
+        self.last_detections = []
         
     def _download_model(self, proto_path, model_path):
         """Download face detection model files if they don't exist"""
         os.makedirs(os.path.dirname(proto_path), exist_ok=True)
-        
-        # Download prototxt
+
         proto_url = "https://raw.githubusercontent.com/opencv/opencv/master/samples/dnn/face_detector/deploy.prototxt"
-        os.system(f"wget {proto_url} -O {proto_path}")
-        
-        # Download model
         model_url = "https://raw.githubusercontent.com/opencv/opencv_3rdparty/dnn_samples_face_detector_20170830/res10_300x300_ssd_iter_140000.caffemodel"
-        os.system(f"wget {model_url} -O {model_path}")
+
+        # urlretrieve keeps the download in-process: no shell fork, and no
+        # dependency on a wget binary being installed
+        try:
+            urlretrieve(proto_url, proto_path)
+            urlretrieve(model_url, model_path)
+        except URLError as e:
+            print(f"Error downloading face detection model: {e}")
+            raise
     
-    def detect(self, frame):
+    def detect(self, frame, draw=True):
         """
         Detect faces in a frame
-        
+
         Args:
             frame (numpy.ndarray): Input image
-            
+            draw (bool): Annotate the frame with the detections
+
         Returns:
             list: List of detected face bounding boxes [x, y, width, height]
         """
-        # Get frame dimensions
-        (h, w) = frame.shape[:2]
-        
-        # Create a blob from the frame
-        blob = cv2.dnn.blobFromImage(
-            cv2.resize(frame, (300, 300)), 1.0, (300, 300),
+        faces = self.detect_batch([frame])[0]
+        if draw:
+            self.draw_detections(frame)
+        return faces
+
+    def detect_batch(self, frames):
+        """
+        Detect faces in several frames with a single batched forward pass
+
+        Submitting all frames as one blob lets the SSD reuse its weights
+        across the batch instead of paying a full forward per frame, which
+        matters if a second (e.g. rear-view) camera or a retry pass is ever
+        added. With a single frame this degenerates to the old behaviour.
+
+        Args:
+            frames (list): Input images, all the same size
+
+        Returns:
+            list: Per-frame lists of face bounding boxes [x, y, width, height]
+        """
+        # Get frame dimensions (the batch shares one camera resolution)
+        (h, w) = frames[0].shape[:2]
+
+        # Refresh the cached scaling vector if the frame size changed
+        if self._scale_shape != (w, h):
+            self._scale = np.array([w, h, w, h], dtype=np.float32)
+            self._scale_shape = (w, h)
+
+        # Create one blob for the whole batch; blobFromImages resizes to
+        # 300x300 itself, so resizing beforehand would just add a second
+        # full pass over each image plus a temporary copy
+        blob = cv2.dnn.blobFromImages(
+            frames, 1.0, (300, 300),
             (104.0, 177.0, 123.0), swapRB=False, crop=False
         )
-        
+
         # Pass the blob through the network
         self.face_net.setInput(blob)
         detections = self.face_net.forward()
-        
-        # Process detections
-        faces = []
-        for i in range(0, detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            
-            # Filter out weak detections
-            if confidence < self.confidence_threshold:
-                continue
-            
-            # Compute bounding box
-            box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-            (startX, startY, endX, endY) = box.astype("int")
-            
-            # Ensure the bounding box falls within the frame dimensions
-            startX = max(0, startX)
-            startY = max(0, startY)
-            endX = min(w, endX)
-            endY = min(h, endY)
-            
-            # Extract face region
-            face = [startX, startY, endX - startX, endY - startY]
-            faces.append(face)
-            
+
+        # The SSD flattens detections for the whole batch along axis 2 and
+        # tags each row with its image index in column 0
+        dets = detections[0, 0]
+
+        all_faces = []
+        results = []
+        for i in range(len(frames)):
+            # Filter out weak detections for this image and scale the
+            # surviving boxes in one vectorized pass over the ~200 SSD
+            # candidates; the Python loop below only runs over the one or
+            # two confident faces
+            mask = (dets[:, 0] == i) & (dets[:, 2] >= self.confidence_threshold)
+            confidences = dets[mask, 2]
+            boxes = (dets[mask, 3:7] * self._scale).astype(np.int32)
+
+            # Ensure the bounding boxes fall within the frame dimensions
+            boxes[:, 0::2] = np.clip(boxes[:, 0::2], 0, w)
+            boxes[:, 1::2] = np.clip(boxes[:, 1::2], 0, h)
+
+            results.append((boxes, confidences))
+            all_faces.append([[int(sx), int(sy), int(ex - sx), int(ey - sy)]
+                              for (sx, sy, ex, ey) in boxes])
+
+        self.last_detections = results
+        return all_faces
+
+    def draw_detections(self, frame, index=0):
+        """
+        Draw the boxes and confidences from the most recent detection
+
+        Kept separate from detect_batch so a worker thread can run the
+        forward pass on a frame snapshot while the main thread annotates
+        whichever frame it is about to display.
+
+        Args:
+            frame (numpy.ndarray): Image to annotate in place
+            index (int): Which batch entry's detections to draw
+        """
+        boxes, confidences = self.last_detections[index]
+        for (startX, startY, endX, endY), confidence in zip(boxes, confidences):
+            startX, startY, endX, endY = int(startX), int(startY), int(endX), int(endY)
+
             # Draw bounding box
             cv2.rectangle(frame, (startX, startY), (endX, endY), (0, 255, 0), 2)
-            
+
             # Display confidence
             text = f"{confidence * 100:.2f}%"
             y = startY - 10 if startY - 10 > 10 else startY + 10
             cv2.putText(frame, text, (startX, y),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 2)
-        
-        return faces
\ No newline at end of file
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 2)
\ No newline at end of file
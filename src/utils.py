@@ -2,34 +2,88 @@
 Utility functions for driver drowsiness detection system
 """
 
+import collections
 import time
 import cv2
+import numpy as np
+
+# Pre-rendered static overlay pixels, keyed by frame size. The metric boxes
+# and their label text never change, so they are rasterized once and blitted
+# onto each frame instead of being redrawn ~30 times a second.
+_eye_panel_cache = {}
+
+# Last rendered HUD string per call site: {key: (text, color, sprite, mask, th)}
+_text_sprite_cache = {}
+
+
+def cached_putText(frame, text, pos, key, font_scale=0.7, color=(0, 255, 0), thickness=2):
+    """
+    Draw text, reusing a cached glyph sprite while the string is unchanged
+
+    HUD values like FPS or the status line change slowly compared to the
+    frame rate, yet cv2.putText rasterizes the glyphs from scratch on every
+    call. This renders the string once onto a minimal canvas and blits the
+    lit pixels per frame; a new string (or color) re-renders the sprite.
+
+    Args:
+        frame (numpy.ndarray): Input image
+        text (str): Text to display
+        pos (tuple): Baseline-left position (x, y), as for cv2.putText
+        key (str): Stable identifier for this call site's cache slot
+        font_scale (float): Font scale
+        color (tuple): BGR color of text
+        thickness (int): Thickness of text
+
+    Returns:
+        None (modifies frame in-place)
+    """
+    entry = _text_sprite_cache.get(key)
+    if entry is None or entry[0] != text or entry[1] != color:
+        (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX,
+                                             font_scale, thickness)
+        sprite = np.zeros((th + baseline, tw, 3), dtype=np.uint8)
+        cv2.putText(sprite, text, (0, th), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, color, thickness)
+        entry = (text, color, sprite, sprite.any(axis=2), th)
+        _text_sprite_cache[key] = entry
+
+    _, _, sprite, mask, th = entry
+    x, y = pos
+    h, w = sprite.shape[:2]
+    y0 = y - th
+    roi = frame[y0:y0 + h, x:x + w]
+    if roi.shape[:2] != (h, w):
+        # Sprite would fall off the frame; render directly rather than clip
+        cv2.putText(frame, text, pos, cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, color, thickness)
+        return
+    roi[mask] = sprite[mask]
 
 class FPS:
     """
     Class to calculate frames per second
+
+    Keeps the last 30 frame timestamps in a ring buffer and reports the
+    rate over that sliding window, so the HUD value updates smoothly every
+    frame instead of jumping every 10th. monotonic_ns is immune to
+    wall-clock (NTP) adjustments that would skew time.time() deltas.
     """
-    
+
     def __init__(self):
         """Initialize the FPS counter"""
-        self.start_time = None
-        self.frame_count = 0
-        self.fps = 0
-    
+        self._ts = collections.deque(maxlen=30)
+        self.fps = 0.0
+
     def start(self):
-        """Start counting a new frame"""
-        if self.start_time is None:
-            self.start_time = time.time()
-        self.frame_count += 1
-    
+        """Kept for API compatibility; update() now does all bookkeeping"""
+        pass
+
     def update(self):
-        """Update FPS calculation"""
-        if self.frame_count >= 10:
-            elapsed_time = time.time() - self.start_time
-            self.fps = self.frame_count / elapsed_time
-            self.frame_count = 0
-            self.start_time = time.time()
-        
+        """Record a frame timestamp and return the windowed FPS"""
+        self._ts.append(time.monotonic_ns())
+        if len(self._ts) >= 2:
+            self.fps = (len(self._ts) - 1) * 1e9 / (self._ts[-1] - self._ts[0])
+
         return self.fps
 
 
@@ -63,8 +117,9 @@ def draw_status(frame, drowsiness_level, ear_value):
         color = (0, 0, 255)  # Red
         status_text = "EXTREMELY DROWSY - DANGER"
     
-    # Draw status bar background
-    cv2.rectangle(frame, (0, status_bar_y), (w, h), (0, 0, 0), -1)
+    # Status bar background is plain black, so a direct slice assignment is
+    # cheaper than re-rasterizing a filled rectangle every frame
+    frame[status_bar_y:h] = 0
     
     # Draw colored status indicator
     indicator_width = 60
@@ -99,6 +154,32 @@ def create_roi(frame, rect):
     return frame[y:y+h, x:x+w]
 
 
+def _render_eye_panels():
+    """
+    Pre-render the static parts of the eye-metric panels
+
+    Builds the two 160x90 background boxes with their fixed labels already
+    drawn; label coordinates are the on-frame positions shifted into the
+    panel, whose top-left corner sits 5px left and 25px above the first label.
+
+    Returns:
+        tuple: (left panel, right panel) uint8 images
+    """
+    left = np.zeros((90, 160, 3), dtype=np.uint8)
+    cv2.putText(left, "Left Eye EAR:", (5, 25),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    cv2.putText(left, "Right Eye EAR:", (5, 45),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    cv2.putText(left, "Avg. EAR:", (5, 65),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+    right = np.zeros((90, 160, 3), dtype=np.uint8)
+    cv2.putText(right, "Threshold:", (5, 25),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+    return left, right
+
+
 def display_eye_tracking_data(frame, left_ear, right_ear, avg_ear, eye_thresh):
     """
     Display eye tracking data on frame
@@ -114,30 +195,27 @@ def display_eye_tracking_data(frame, left_ear, right_ear, avg_ear, eye_thresh):
         None (modifies frame in-place)
     """
     # Set metrics position
+    h, w = frame.shape[:2]
     y_pos = 100
     left_x = 10
-    right_x = frame.shape[1] - 170
-    
-    # Draw background rectangle for metrics
-    cv2.rectangle(frame, (left_x - 5, y_pos - 25), 
-                 (left_x + 155, y_pos + 65), (0, 0, 0, 0.7), -1)
-    cv2.rectangle(frame, (right_x - 5, y_pos - 25), 
-                 (right_x + 155, y_pos + 65), (0, 0, 0, 0.7), -1)
-    
+    right_x = w - 170
+
+    # Blit the pre-rendered panel backgrounds (boxes + fixed labels); only
+    # the numeric values below are rasterized per frame
+    panels = _eye_panel_cache.get((h, w))
+    if panels is None:
+        panels = _eye_panel_cache[(h, w)] = _render_eye_panels()
+    left_panel, right_panel = panels
+    frame[y_pos - 25:y_pos + 65, left_x - 5:left_x + 155] = left_panel
+    frame[y_pos - 25:y_pos + 65, right_x - 5:right_x + 155] = right_panel
+
     # Draw metrics
-    cv2.putText(frame, "Left Eye EAR:", (left_x, y_pos),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     cv2.putText(frame, f"{left_ear:.2f}", (left_x + 115, y_pos),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    
-    cv2.putText(frame, "Right Eye EAR:", (left_x, y_pos + 20),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
     cv2.putText(frame, f"{right_ear:.2f}", (left_x + 115, y_pos + 20),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    
-    cv2.putText(frame, "Avg. EAR:", (left_x, y_pos + 40),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    
+
     # Color code the average EAR value based on threshold
     if avg_ear < eye_thresh:
         ear_color = (0, 0, 255)  # Red if below threshold
@@ -146,12 +224,11 @@ def display_eye_tracking_data(frame, left_ear, right_ear, avg_ear, eye_thresh):
     
     cv2.putText(frame, f"{avg_ear:.2f}", (left_x + 115, y_pos + 40),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, ear_color, 1)
-    
-    # Draw threshold value
-    cv2.putText(frame, "Threshold:", (right_x, y_pos),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    cv2.putText(frame, f"{eye_thresh:.2f}", (right_x + 90, y_pos),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+    # Draw threshold value (fixed per run, so the cached sprite always hits)
+    cached_putText(frame, f"{eye_thresh:.2f}", (right_x + 90, y_pos),
+                   key="eye_thresh", font_scale=0.5, color=(255, 255, 255),
+                   thickness=1)
 
 
 def annotate_frame(frame, text, position=(10, 30), font_scale=0.7, color=(0, 255, 0), thickness=2):